@@ -1,11 +1,28 @@
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
+@lru_cache(maxsize=1)
+def _env_snapshot() -> Dict[str, Any]:
+    """Load .env once and return the coerced scraper settings"""
+    load_dotenv()
+    return {
+        "MAX_PAGES": int(os.environ.get("MAX_PAGES", "5")),
+        "DELAY": float(os.environ.get("DELAY", "1.0")),
+        "MAX_RETRIES": int(os.environ.get("MAX_RETRIES", "3")),
+        "TIMEOUT": int(os.environ.get("TIMEOUT", "30")),
+        "OUTPUT_FORMAT": os.environ.get("OUTPUT_FORMAT", "json"),
+        "OUTPUT_DIR": os.environ.get("OUTPUT_DIR", "output"),
+        "CONCURRENT_REQUESTS": int(os.environ.get("CONCURRENT_REQUESTS", "5")),
+        "STREAM_OUTPUT": os.environ.get("STREAM_OUTPUT", "false").lower() in ("1", "true", "yes"),
+        "COMPRESS_OUTPUT": os.environ.get("COMPRESS_OUTPUT", "false").lower() in ("1", "true", "yes"),
+        "PARSE_WORKERS": int(os.environ.get("PARSE_WORKERS", "0")),
+    }
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ScraperConfig:
     """Configuration class for the scraper"""
     base_url: str
@@ -17,15 +34,30 @@ class ScraperConfig:
     output_format: str = "json"  # json, csv, or both
     output_directory: str = "output"
     concurrent_requests: int = 5
+    stream_output: bool = False  # write books page by page instead of at the end
+    compress_output: bool = False  # gzip the JSON output (.json.gz)
+    parse_workers: int = 0  # parse pages in this many processes; 0 parses on the event loop
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SiteConfig:
     """Configuration for specific website scraping"""
     name: str
     base_url: str
-    selectors: Dict[str, str]
+    # Read-only mapping views are not hashable, so the hash covers the other fields
+    selectors: Mapping[str, str] = field(hash=False)
     pagination_selector: str
-    category_params: Dict[str, str]
+    category_params: Mapping[str, str] = field(hash=False)
+
+    def __post_init__(self):
+        # Selectors and category params are read-only after load. The instance
+        # is frozen, so the read-only views are set via object.__setattr__
+        object.__setattr__(self, "selectors", MappingProxyType(dict(self.selectors)))
+        object.__setattr__(self, "category_params", MappingProxyType(dict(self.category_params)))
+
+    def __reduce__(self):
+        # mappingproxy cannot be pickled; rebuild from plain dicts instead
+        return (SiteConfig, (self.name, self.base_url, dict(self.selectors),
+                             self.pagination_selector, dict(self.category_params)))
 
 # Periplus website configuration
 PERIPLUS_CONFIG = SiteConfig(
@@ -49,14 +81,18 @@ PERIPLUS_CONFIG = SiteConfig(
 )
 
 # Default scraper configuration
+_env = _env_snapshot()
 DEFAULT_CONFIG = ScraperConfig(
     base_url=PERIPLUS_CONFIG.base_url,
     category_param="103",  # Default to new releases
-    max_pages=int(os.getenv("MAX_PAGES", "5")),
-    delay_between_requests=float(os.getenv("DELAY", "1.0")),
-    max_retries=int(os.getenv("MAX_RETRIES", "3")),
-    timeout=int(os.getenv("TIMEOUT", "30")),
-    output_format=os.getenv("OUTPUT_FORMAT", "json"),
-    output_directory=os.getenv("OUTPUT_DIR", "output"),
-    concurrent_requests=int(os.getenv("CONCURRENT_REQUESTS", "5"))
+    max_pages=_env["MAX_PAGES"],
+    delay_between_requests=_env["DELAY"],
+    max_retries=_env["MAX_RETRIES"],
+    timeout=_env["TIMEOUT"],
+    output_format=_env["OUTPUT_FORMAT"],
+    output_directory=_env["OUTPUT_DIR"],
+    concurrent_requests=_env["CONCURRENT_REQUESTS"],
+    stream_output=_env["STREAM_OUTPUT"],
+    compress_output=_env["COMPRESS_OUTPUT"],
+    parse_workers=_env["PARSE_WORKERS"]
 )
\ No newline at end of file
@@ -5,6 +5,10 @@ Demo script showcasing the Scalable Data Scraper
 
 import asyncio
 import json
+try:
+    import uvloop  # optional libuv-based event loop with lower per-callback overhead
+except ImportError:
+    uvloop = None
 from scraper import DataScraper
 from config import PERIPLUS_CONFIG, ScraperConfig
 
@@ -79,4 +83,7 @@ async def main():
         print("Run 'python main.py --help' for all options")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if uvloop:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
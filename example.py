@@ -6,14 +6,18 @@ This file demonstrates different ways to use the scraper programmatically
 
 import asyncio
 import json
-from scraper import DataScraper
+try:
+    import uvloop  # optional libuv-based event loop with lower per-callback overhead
+except ImportError:
+    uvloop = None
+from scraper import DataScraper, get_shared_session, close_shared_session
 from config import PERIPLUS_CONFIG, DEFAULT_CONFIG, ScraperConfig
 
-async def example_basic_scraping():
+async def example_basic_scraping(session=None):
     """Basic example: Scrape new releases with default settings"""
     print("=== Basic Scraping Example ===")
     
-    async with DataScraper(PERIPLUS_CONFIG, DEFAULT_CONFIG) as scraper:
+    async with DataScraper(PERIPLUS_CONFIG, DEFAULT_CONFIG, session=session) as scraper:
         result = await scraper.run_scraper(
             category_name="new_releases",
             max_pages=2  # Limit to 2 pages for example
@@ -29,7 +33,7 @@ async def example_basic_scraping():
             print(f"  Author: {book.author}")
             print(f"  Price: {book.price}")
 
-async def example_custom_config():
+async def example_custom_config(session=None):
     """Example with custom configuration"""
     print("\n=== Custom Configuration Example ===")
     
@@ -43,7 +47,7 @@ async def example_custom_config():
         output_directory="custom_output"
     )
     
-    async with DataScraper(PERIPLUS_CONFIG, custom_config) as scraper:
+    async with DataScraper(PERIPLUS_CONFIG, custom_config, session=session) as scraper:
         result = await scraper.run_scraper(
             category_name="new_releases",
             max_pages=1
@@ -52,7 +56,7 @@ async def example_custom_config():
         print(f"Custom scrape completed: {result.total_books} books")
         print(f"Files saved to: {custom_config.output_directory}")
 
-async def example_multiple_categories():
+async def example_multiple_categories(session=None):
     """Example of scraping multiple categories"""
     print("\n=== Multiple Categories Example ===")
     
@@ -71,7 +75,7 @@ async def example_multiple_categories():
         # "bestsellers": "104",  # Example - may not be correct
     }
     
-    async with DataScraper(PERIPLUS_CONFIG, demo_config) as scraper:
+    async with DataScraper(PERIPLUS_CONFIG, demo_config, session=session) as scraper:
         results = await scraper.scrape_multiple_categories(categories, max_pages=1)
         
         total_books = 0
@@ -81,11 +85,11 @@ async def example_multiple_categories():
         
         print(f"Total books across all categories: {total_books}")
 
-async def example_data_processing():
+async def example_data_processing(session=None):
     """Example of processing scraped data"""
     print("\n=== Data Processing Example ===")
     
-    async with DataScraper(PERIPLUS_CONFIG, DEFAULT_CONFIG) as scraper:
+    async with DataScraper(PERIPLUS_CONFIG, DEFAULT_CONFIG, session=session) as scraper:
         result = await scraper.run_scraper(
             category_name="new_releases",
             max_pages=1
@@ -116,12 +120,16 @@ async def main():
     print("Scalable Data Scraper - Examples")
     print("=" * 50)
     
+    # The examples run one after another, so they share a session and reuse
+    # its open connections instead of reconnecting for each scraper
+    session = await get_shared_session()
+    
     try:
         # Run examples
-        await example_basic_scraping()
-        await example_custom_config()
-        await example_multiple_categories()
-        await example_data_processing()
+        await example_basic_scraping(session)
+        await example_custom_config(session)
+        await example_multiple_categories(session)
+        await example_data_processing(session)
         
         print("\n" + "=" * 50)
         print("All examples completed successfully!")
@@ -131,6 +139,11 @@ async def main():
         print(f"\nError running examples: {e}")
         print("This might be due to network issues or changes in the website structure.")
         print("Try running with a smaller number of pages or check your internet connection.")
+    finally:
+        await close_shared_session()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if uvloop:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -7,45 +7,71 @@ Description: A flexible and scalable web scraper for e-commerce sites
 
 import asyncio
 import argparse
+import atexit
 import logging
-from typing import Optional
+import logging.handlers
+from typing import Optional, TYPE_CHECKING
 
-from scraper import DataScraper
-from config import PERIPLUS_CONFIG, DEFAULT_CONFIG, ScraperConfig
-from models import ScrapingResult
+# The scraper stack (aiohttp, selectolax, pydantic) is imported lazily inside
+# the run functions so that `--help` and argument errors return immediately
+if TYPE_CHECKING:
+    from config import ScraperConfig
 
-def setup_logging(log_level: str = "INFO"):
+def setup_logging(log_level: str = "INFO") -> logging.handlers.MemoryHandler:
     """Setup logging configuration"""
     numeric_level = getattr(logging, log_level.upper(), None)
     if not isinstance(numeric_level, int):
         raise ValueError(f'Invalid log level: {log_level}')
     
+    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    
+    # Buffer file records and write them in batches; errors flush immediately
+    file_handler = logging.FileHandler('scraper.log', delay=True)
+    file_handler.setFormatter(logging.Formatter(log_format))
+    memory_handler = logging.handlers.MemoryHandler(1024, flushLevel=logging.ERROR, target=file_handler)
+    atexit.register(memory_handler.flush)
+    
     logging.basicConfig(
         level=numeric_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        format=log_format,
         handlers=[
             logging.StreamHandler(),
-            logging.FileHandler('scraper.log')
+            memory_handler
         ]
     )
+    return memory_handler
 
-def create_custom_config(args) -> ScraperConfig:
+def create_custom_config(args) -> "ScraperConfig":
     """Create custom scraper configuration from CLI arguments"""
-    config = ScraperConfig(
-        base_url=DEFAULT_CONFIG.base_url,
-        category_param=args.category_param or DEFAULT_CONFIG.category_param,
-        max_pages=args.max_pages or DEFAULT_CONFIG.max_pages,
-        delay_between_requests=args.delay or DEFAULT_CONFIG.delay_between_requests,
-        max_retries=args.retries or DEFAULT_CONFIG.max_retries,
-        timeout=args.timeout or DEFAULT_CONFIG.timeout,
-        output_format=args.output_format or DEFAULT_CONFIG.output_format,
-        output_directory=args.output_dir or DEFAULT_CONFIG.output_directory,
-        concurrent_requests=args.concurrent or DEFAULT_CONFIG.concurrent_requests
+    import dataclasses
+    from config import DEFAULT_CONFIG
+    
+    # Only options given on the command line override the defaults; checking
+    # for None (rather than truthiness) keeps legitimate zero values like --delay 0
+    overrides = {
+        "category_param": args.category_param,
+        "max_pages": args.max_pages,
+        "delay_between_requests": args.delay,
+        "max_retries": args.retries,
+        "timeout": args.timeout,
+        "output_format": args.output_format,
+        "output_directory": args.output_dir,
+        "concurrent_requests": args.concurrent,
+        "stream_output": args.stream,
+        "compress_output": args.compress,
+        "parse_workers": args.parse_workers,
+    }
+    config = dataclasses.replace(
+        DEFAULT_CONFIG,
+        **{field: value for field, value in overrides.items() if value is not None}
     )
     return config
 
 async def run_single_category_scraper(args):
     """Run scraper for a single category"""
+    from scraper import DataScraper
+    from config import PERIPLUS_CONFIG
+    
     config = create_custom_config(args)
     
     async with DataScraper(PERIPLUS_CONFIG, config) as scraper:
@@ -77,23 +103,30 @@ async def run_single_category_scraper(args):
 
 async def run_multiple_categories_scraper(args):
     """Run scraper for multiple categories"""
+    from scraper import DataScraper
+    from config import PERIPLUS_CONFIG
+    
     config = create_custom_config(args)
-    categories = {}
+    predefined = PERIPLUS_CONFIG.category_params
+    
+    def parse_category(category_pair: str):
+        # "name:param" is used as given; a bare name is looked up in the predefined categories
+        name, separator, param = category_pair.partition(':')
+        name = name.strip()
+        return name, param.strip() if separator else predefined.get(name)
     
     # Parse categories from command line (format: "name1:param1,name2:param2")
+    categories = {}
     if args.categories:
-        for category_pair in args.categories.split(','):
-            if ':' in category_pair:
-                name, param = category_pair.split(':', 1)
-                categories[name.strip()] = param.strip()
-            else:
-                # Use predefined categories from config
-                if category_pair.strip() in PERIPLUS_CONFIG.category_params:
-                    categories[category_pair.strip()] = PERIPLUS_CONFIG.category_params[category_pair.strip()]
+        categories = {
+            name: param
+            for name, param in map(parse_category, args.categories.split(','))
+            if param
+        }
     
     if not categories:
         # Default to all predefined categories
-        categories = PERIPLUS_CONFIG.category_params
+        categories = predefined
     
     async with DataScraper(PERIPLUS_CONFIG, config) as scraper:
         results = await scraper.scrape_multiple_categories(categories, args.max_pages)
@@ -163,12 +196,18 @@ Examples:
                        help='Request timeout in seconds (default: 30)')
     parser.add_argument('--concurrent', type=int, default=5,
                        help='Number of concurrent requests (default: 5)')
+    parser.add_argument('--parse-workers', type=int,
+                       help='Parse pages in this many worker processes (default: 0, parse in-process)')
     
     # Output configuration
     parser.add_argument('--output-format', choices=['json', 'csv', 'both'], default='json',
                        help='Output format (default: json)')
     parser.add_argument('--output-dir', default='output',
                        help='Output directory (default: output)')
+    parser.add_argument('--stream', action='store_true', default=None,
+                       help='Write books to the output files page by page instead of at the end')
+    parser.add_argument('--compress', action='store_true', default=None,
+                       help='Gzip-compress the JSON output (.json.gz)')
     
     # Logging
     parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], 
@@ -177,15 +216,22 @@ Examples:
     args = parser.parse_args()
     
     # Setup logging
-    setup_logging(args.log_level)
+    log_buffer = setup_logging(args.log_level)
+    
+    # Run scraper, on uvloop when it is installed
+    try:
+        import uvloop
+        run = uvloop.run
+    except ImportError:
+        run = asyncio.run
     
-    # Run scraper
     try:
         if args.multiple:
-            asyncio.run(run_multiple_categories_scraper(args))
+            run(run_multiple_categories_scraper(args))
         else:
-            asyncio.run(run_single_category_scraper(args))
+            run(run_single_category_scraper(args))
     except KeyboardInterrupt:
+        log_buffer.flush()
         print("\n\nScraping interrupted by user")
     except Exception as e:
         logging.error(f"Scraping failed: {str(e)}")
@@ -1,9 +1,11 @@
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, ConfigDict, HttpUrl, Field
 from typing import Optional, List
 from datetime import datetime
 
 class Book(BaseModel):
     """Data model for a book"""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     title: str
     author: Optional[str] = None
     price: Optional[str] = None
@@ -12,11 +14,6 @@ class Book(BaseModel):
     availability: Optional[str] = None
     category: Optional[str] = None
     scraped_at: datetime = Field(default_factory=datetime.now)
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class ScrapingResult(BaseModel):
     """Model for scraping results"""
@@ -28,9 +25,4 @@ class ScrapingResult(BaseModel):
     scraping_started: datetime
     scraping_completed: datetime
     success: bool = True
-    errors: List[str] = []
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
+    errors: List[str] = []
\ No newline at end of file
@@ -1,283 +1,681 @@
 import asyncio
 import aiohttp
+import itertools
 import time
+from concurrent.futures import ProcessPoolExecutor
 import logging
-import json
-import csv
+import multiprocessing
+import gzip
+import importlib.util
+import io
 import os
-from typing import List, Dict, Optional, Union
-from urllib.parse import urljoin, urlparse, parse_qs, urlencode, urlunparse
-from bs4 import BeautifulSoup
+import random
+import re
+import sys
+from operator import attrgetter
+from typing import Any, List, Dict, Optional, Tuple, Union
+from urllib.parse import quote, urljoin, urlsplit
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 from fake_useragent import UserAgent
 from datetime import datetime
-import pandas as pd
+import orjson
 
 from models import Book, ScrapingResult
 from config import ScraperConfig, SiteConfig, PERIPLUS_CONFIG, DEFAULT_CONFIG
 
+# Install uvloop's policy at import so any asyncio.run() driving a DataScraper gets the
+# libuv loop. Loop policies are deprecated from Python 3.14; entry points use uvloop.run()
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+if uvloop is not None and sys.version_info < (3, 14):
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class DataScraper:
-    """Scalable data scraper with configurable parameters"""
+# aiohttp decodes brotli bodies transparently when a brotli module is installed
+ACCEPT_ENCODING = (
+    'gzip, deflate, br'
+    if any(importlib.util.find_spec(module) for module in ("brotli", "brotlicffi"))
+    else 'gzip, deflate'
+)
+
+# Statuses that mean the server is overloaded or rate limiting; retried with backoff.
+# Other 5xx responses are retried at most SERVER_ERROR_RETRIES times, other 4xx never
+OVERLOAD_STATUSES = frozenset({429, 503, 504})
+SERVER_ERROR_RETRIES = 1
+MAX_RETRY_DELAY = 30
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, so parallel fetches do not retry in lockstep"""
+    return min(MAX_RETRY_DELAY, 2 ** attempt + random.random())
+
+# Lexbor reads raw bytes as UTF-8, whatever the page declares, so only UTF-8
+# pages skip the decode; a <meta> charset is honoured when the header has none
+_UTF8_CHARSETS = frozenset({"utf-8", "utf8"})
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+def _decode_html(content: bytes, charset: Optional[str]) -> Union[bytes, str]:
+    """Return a UTF-8 page body as raw bytes for the parser, decoding any other charset"""
+    if not charset:
+        match = _META_CHARSET.search(content, 0, 1024)
+        charset = match.group(1).decode('ascii') if match else None
+    if not charset or charset.lower() in _UTF8_CHARSETS:
+        return content
+    try:
+        return content.decode(charset, errors='replace')
+    except LookupError:
+        logger.warning(f"Unknown charset {charset!r}, parsing as UTF-8")
+        return content
+
+# Write buffer for output files; amortizes many small writes into few syscalls
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Book CSV layout, in model field order; the schema is fixed so rows are formatted directly
+CSV_FIELDS = tuple(Book.model_fields)
+CSV_BATCH_SIZE = 1000
+_CSV_HEADER = ",".join(CSV_FIELDS) + "\n"
+_CSV_ROW = ",".join(["{}"] * len(CSV_FIELDS)) + "\n"
+# Reads every CSV column off a book as one tuple in a single C-level call
+_csv_values = attrgetter(*CSV_FIELDS)
+
+def _csv_field(value) -> str:
+    """Format a single CSV field, quoting only when required"""
+    if value is None:
+        return ""
+    text = str(value)
+    if '"' in text:
+        return '"' + text.replace('"', '""') + '"'
+    if ',' in text or '\n' in text or '\r' in text:
+        return '"' + text + '"'
+    return text
+
+def _open_json_output(filepath: str, compress: bool = False):
+    """Open a buffered binary JSON output file, gzip-compressed when requested"""
+    if compress:
+        # Level 1 keeps CPU cost negligible while still shrinking the repetitive JSON
+        return io.BufferedWriter(gzip.open(f"{filepath}.gz", 'wb', compresslevel=1), OUTPUT_BUFFER_SIZE)
+    return open(filepath, 'wb', buffering=OUTPUT_BUFFER_SIZE)
+
+def _csv_row(book: Book) -> str:
+    """Format a book as a single CSV line"""
+    return _CSV_ROW.format(*map(_csv_field, _csv_values(book)))
+
+class BookStreamWriter:
+    """Writes books to JSON/CSV output incrementally as pages are scraped"""
     
-    def __init__(self, site_config: SiteConfig, scraper_config: ScraperConfig):
-        self.site_config = site_config
-        self.scraper_config = scraper_config
-        self.ua = UserAgent()
-        self.session = None
-        self.books_scraped = []
-        self.errors = []
+    def __init__(self, json_path: Optional[str], csv_path: Optional[str], header: Dict[str, Any],
+                 compress: bool = False):
+        self.count = 0
+        self._json_file = None
+        self._csv_file = None
+        
+        if json_path:
+            # Emit the result object up to the opening of its books array
+            self._json_file = _open_json_output(json_path, compress)
+            self._json_file.write(orjson.dumps(header)[:-1] + b',"books":[')
+        
+        if csv_path:
+            self._csv_file = open(csv_path, 'w', newline='', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE)
+            self._csv_file.write(_CSV_HEADER)
+    
+    def write_books(self, books: List[Book]):
+        """Append a page of books to the open output files"""
+        if self._json_file:
+            chunk = b",".join(orjson.dumps(book.model_dump()) for book in books)
+            if chunk:
+                self._json_file.write(b"," + chunk if self.count else chunk)
         
-        # Create output directory if it doesn't exist
-        os.makedirs(self.scraper_config.output_directory, exist_ok=True)
+        if self._csv_file:
+            self._csv_file.write("".join(_csv_row(book) for book in books))
+        
+        self.count += len(books)
+    
+    def close(self, footer: Optional[Dict[str, Any]] = None):
+        """Terminate the JSON document with the remaining result fields and close files"""
+        if self._json_file:
+            self._json_file.write(b"]," + orjson.dumps(footer)[1:] if footer else b"]}")
+            self._json_file.close()
+            logger.info(f"Data saved to {self._json_file.name}")
+            self._json_file = None
+        
+        if self._csv_file:
+            self._csv_file.close()
+            logger.info(f"Data saved to {self._csv_file.name}")
+            self._csv_file = None
+
+class AdaptiveConcurrencyLimiter:
+    """Limits in-flight requests, backing off when the server signals overload
+    
+    Works like TCP congestion control (AIMD): the limit is halved on a 429 or
+    timeout and grows by one after a run of successful requests, never leaving
+    the [min_limit, max_limit] range. Entering the limiter yields the current
+    generation; overloads reported for requests started before the last decrease
+    belong to the same congestion event and do not halve the limit again.
+    """
+    
+    def __init__(self, max_limit: int, min_limit: int = 1, increase_after: int = 10):
+        # A max below min_limit (e.g. concurrent_requests=0) would never admit a request
+        self.limit = self.max_limit = max(min_limit, max_limit)
+        self.min_limit = min_limit
+        self.increase_after = increase_after
+        self._in_flight = 0
+        self._successes = 0
+        self.generation = 0
+        self._condition = asyncio.Condition()
     
     async def __aenter__(self):
-        """Async context manager entry"""
-        connector = aiohttp.TCPConnector(limit=self.scraper_config.concurrent_requests)
-        timeout = aiohttp.ClientTimeout(total=self.scraper_config.timeout)
-        self.session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout,
-            headers={'User-Agent': self.ua.random}
-        )
-        return self
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self.generation
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
     
-    def _get_headers(self) -> Dict[str, str]:
-        """Get random headers for requests"""
-        return {
-            'User-Agent': self.ua.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
+    def record_success(self):
+        """Grow the limit by one after increase_after consecutive successes"""
+        self._successes += 1
+        if self._successes >= self.increase_after:
+            self._successes = 0
+            if self.limit < self.max_limit:
+                self.limit += 1
+                logger.debug(f"Concurrency limit raised to {self.limit}")
     
-    async def _fetch_page(self, url: str, retries: int = None) -> Optional[str]:
-        """Fetch a single page with retry logic"""
-        if retries is None:
-            retries = self.scraper_config.max_retries
-        
-        for attempt in range(retries + 1):
-            try:
-                async with self.session.get(url, headers=self._get_headers()) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        logger.info(f"Successfully fetched: {url}")
-                        return content
-                    elif response.status == 429:  # Rate limited
-                        wait_time = 2 ** attempt
-                        logger.warning(f"Rate limited. Waiting {wait_time}s before retry...")
-                        await asyncio.sleep(wait_time)
-                    else:
-                        logger.warning(f"HTTP {response.status} for {url}")
-                        
-            except Exception as e:
-                error_msg = f"Attempt {attempt + 1} failed for {url}: {str(e)}"
-                logger.error(error_msg)
-                if attempt == retries:
-                    self.errors.append(error_msg)
-                else:
-                    await asyncio.sleep(2 ** attempt)
-        
-        return None
+    def record_overload(self, generation: int):
+        """Halve the limit after the server pushed back on a request started in generation"""
+        self._successes = 0
+        if generation < self.generation:
+            # Already backed off for this burst
+            return
+        new_limit = max(self.min_limit, self.limit // 2)
+        if new_limit != self.limit:
+            self.limit = new_limit
+            self.generation += 1
+            logger.warning(f"Server overloaded, concurrency limit lowered to {self.limit}")
+
+# Default for the optional "current_price" site selector
+CURRENT_PRICE_SELECTOR = (
+    "div:not([style*='text-decoration:line-through'])"
+    ":not(:has([style*='text-decoration:line-through']))"
+)
+
+class PageParser:
+    """Extracts books from listing pages of a site
     
-    def _parse_book(self, book_element, category: str) -> Optional[Book]:
+    Holds only plain strings and dicts so it can be pickled into parse worker processes.
+    """
+    
+    def __init__(self, site_config: SiteConfig):
+        self._base_url = site_config.base_url
+        # Scheme and host of the site, for resolving root-relative links
+        base_url_parts = urlsplit(site_config.base_url)
+        self._base_url_root = f"{base_url_parts.scheme}://{base_url_parts.netloc}"
+        
+        # Resolve every selector the parser uses once, so the per-element hot
+        # loop indexes a plain dict instead of the read-only config mapping.
+        # selectolax has no public compiled-selector object, so the strings are cached
+        self._selectors = {
+            **site_config.selectors,
+            "author_section": ".product-author",
+            "author_links": "a",
+            # Within "price": a div that is not, and does not wrap, a crossed-out price
+            "current_price": site_config.selectors.get("current_price", CURRENT_PRICE_SELECTOR),
+            # Containers with any product (/p/) link; the parser drops category
+            # tiles with none before the first-link check runs in Python
+            "product": f"{site_config.selectors['product_container']}:has(a[href*='/p/'])",
+            "product_link": "a",
+            "pagination": site_config.pagination_selector,
+        }
+    
+    def _parse_book(self, book_element: LexborNode, category: str, scraped_at: datetime,
+                    errors: List[str]) -> Optional[Book]:
         """Parse a single book element"""
+        selectors = self._selectors
         try:
             # Extract title
-            title_elem = book_element.select_one(self.site_config.selectors["title"])
-            title = title_elem.get_text(strip=True) if title_elem else None
+            title_elem = book_element.css_first(selectors["title"])
+            title = title_elem.text(strip=True) if title_elem else None
             
             # Extract author
-            author_elem = book_element.select_one(self.site_config.selectors["author"])
+            author_elem = book_element.css_first(selectors["author"])
             author = None
             if author_elem:
-                author = author_elem.get_text(strip=True)
+                author = author_elem.text(strip=True)
             else:
                 # Try alternative selector for nested author links
-                author_section = book_element.select_one(".product-author")
+                author_section = book_element.css_first(selectors["author_section"])
                 if author_section:
-                    author_links = author_section.find_all('a')
+                    author_links = author_section.css(selectors["author_links"])
                     for link in author_links:
-                        text = link.get_text(strip=True)
+                        text = link.text(strip=True)
                         if text and text != "":
                             author = text
                             break
             
             # Extract price
-            price_elem = book_element.select_one(self.site_config.selectors["price"])
+            price_elem = book_element.css_first(selectors["price"])
             price = None
             if price_elem:
-                # Find the actual price (not crossed out price)
-                price_divs = price_elem.find_all('div')
-                for div in price_divs:
-                    text = div.get_text(strip=True)
-                    # Look for the current price (not crossed out)
-                    if text and 'Rp' in text and 'text-decoration:line-through' not in str(div):
+                # Find the actual price; the selector already drops crossed-out divs
+                # (and wrappers around them), so no per-div HTML serialization is needed
+                for div in price_elem.css(selectors["current_price"]):
+                    # Lexbor matches the context node itself; only look at nested divs
+                    if div.mem_id == price_elem.mem_id:
+                        continue
+                    text = div.text(strip=True)
+                    if 'Rp' in text:
                         price = text
                         break
                 if not price:
-                    price = price_elem.get_text(strip=True)
+                    price = price_elem.text(strip=True)
             
             # Extract image URL
-            image_elem = book_element.select_one(self.site_config.selectors["image"])
+            image_elem = book_element.css_first(selectors["image"])
             image_url = None
             if image_elem:
-                image_url = image_elem.get('src') or image_elem.get('data-src')
-                if image_url and not image_url.startswith('http'):
-                    image_url = urljoin(self.site_config.base_url, image_url)
+                image_url = image_elem.attributes.get('src') or image_elem.attributes.get('data-src')
+                image_url = self._absolute_url(image_url)
             
             # Extract product URL
-            link_elem = book_element.select_one(self.site_config.selectors["link"])
+            link_elem = book_element.css_first(selectors["link"])
             product_url = None
             if link_elem:
-                product_url = link_elem.get('href')
-                if product_url and not product_url.startswith('http'):
-                    product_url = urljoin(self.site_config.base_url, product_url)
+                product_url = link_elem.attributes.get('href')
+                product_url = self._absolute_url(product_url)
             
             # Extract availability
-            availability_elem = book_element.select_one(self.site_config.selectors["availability"])
-            availability = availability_elem.get_text(strip=True) if availability_elem else None
+            availability_elem = book_element.css_first(selectors["availability"])
+            availability = availability_elem.text(strip=True) if availability_elem else None
             
             if title:  # Only create book if we have at least a title
-                return Book(
+                # Every field is a parsed string (or None) plus the page timestamp,
+                # so skip pydantic validation for this trusted internal data
+                return Book.model_construct(
                     title=title,
                     author=author,
                     price=price,
                     image_url=image_url,
                     product_url=product_url,
                     availability=availability,
-                    category=category
+                    category=category,
+                    scraped_at=scraped_at
                 )
                 
         except Exception as e:
             logger.error(f"Error parsing book element: {str(e)}")
-            self.errors.append(f"Error parsing book: {str(e)}")
+            errors.append(f"Error parsing book: {str(e)}")
         
         return None
     
-    def _parse_page(self, html_content: str, category: str) -> List[Book]:
-        """Parse books from a page"""
-        soup = BeautifulSoup(html_content, 'lxml')
+    def parse_page(self, html_content: Union[bytes, str], category: str) -> Tuple[List[Book], Optional[str], List[str]]:
+        """Parse books, the next page URL and any book errors from a page, parsing the HTML only once"""
+        tree = LexborHTMLParser(html_content)
         books = []
-        
-        # Find all book containers
-        book_elements = soup.select(self.site_config.selectors["product_container"])
-        logger.info(f"Found {len(book_elements)} product elements on page")
-        
-        # Filter to only actual books (not categories)
-        actual_books = []
-        for element in book_elements:
-            link = element.select_one("a")
-            if link and link.get('href'):
-                href = link.get('href')
-                # Only include items that are actual products (have /p/ in URL), not categories (/c/)
-                if '/p/' in href:
-                    actual_books.append(element)
-        
-        logger.info(f"Filtered to {len(actual_books)} actual book products")
-        
+        errors = []
+        
+        # Find the containers of actual books (not categories): the first link
+        # must be a product (/p/) link, not a category (/c/) one
+        product_link = self._selectors["product_link"]
+        actual_books = [
+            element for element in tree.css(self._selectors["product"])
+            if '/p/' in (element.css_first(product_link).attributes.get('href') or '')
+        ]
+        logger.info(f"Found {len(actual_books)} book products on page")
+        
+        # One timestamp per page; books on the same page are scraped together
+        scraped_at = datetime.now()
         for book_element in actual_books:
-            book = self._parse_book(book_element, category)
+            book = self._parse_book(book_element, category, scraped_at, errors)
             if book:
                 books.append(book)
         
-        return books
+        return books, self._get_next_page_url(tree), errors
     
-    def _get_next_page_url(self, html_content: str, current_url: str) -> Optional[str]:
-        """Extract next page URL from current page"""
-        soup = BeautifulSoup(html_content, 'lxml')
-        next_link = soup.select_one(self.site_config.pagination_selector)
+    def _get_next_page_url(self, tree: LexborHTMLParser) -> Optional[str]:
+        """Extract next page URL from an already parsed page"""
+        next_link = tree.css_first(self._selectors["pagination"])
         
         if next_link:
-            next_url = next_link.get('href')
+            next_url = next_link.attributes.get('href')
             if next_url:
-                if not next_url.startswith('http'):
-                    next_url = urljoin(self.site_config.base_url, next_url)
-                return next_url
+                return self._absolute_url(next_url)
+        
+        return None
+    
+    def _absolute_url(self, url: Optional[str]) -> Optional[str]:
+        """Resolve a scraped link against the site, skipping urljoin for the common shapes"""
+        if not url or url.startswith(('http://', 'https://')):
+            return url
+        if url[0] == '/' and not url.startswith('//'):
+            return self._base_url_root + url
+        return urljoin(self._base_url, url)
+
+# forkserver is POSIX-only; spawn works everywhere
+PARSE_WORKER_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Parser for the current parse worker process, installed once by _init_parse_worker
+_worker_parser: Optional[PageParser] = None
+
+def _init_parse_worker(parser: PageParser):
+    """Stash the page parser in a parse worker so it is not re-pickled per page"""
+    global _worker_parser
+    _worker_parser = parser
+
+def _parse_page_worker(html_content: Union[bytes, str], category: str) -> Tuple[List[Book], Optional[str], List[str]]:
+    """Parse a page inside a parse worker process"""
+    return _worker_parser.parse_page(html_content, category)
+
+# Static request headers; the user agent is rotated per request
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+def _create_session(scraper_config: ScraperConfig) -> aiohttp.ClientSession:
+    """Create a client session with a pooled connector sized for the config"""
+    # One pooled connector for the session's lifetime so every fetch reuses
+    # DNS lookups and keep-alive connections instead of re-handshaking
+    # Same floor of one connection as AdaptiveConcurrencyLimiter
+    limit = max(1, scraper_config.concurrent_requests)
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=min(limit, 8),
+        ttl_dns_cache=300,
+        keepalive_timeout=75,
+        enable_cleanup_closed=True
+    )
+    timeout = aiohttp.ClientTimeout(total=scraper_config.timeout)
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers=DEFAULT_HEADERS
+    )
+
+# Sessions are bound to the event loop they were created on, so one is kept per loop
+_shared_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+async def get_shared_session(scraper_config: ScraperConfig = DEFAULT_CONFIG) -> aiohttp.ClientSession:
+    """Return the running loop's shared session for passing to several DataScrapers
+    
+    The session is sized and timed from the scraper_config of the call that
+    creates it; later calls on the same loop get that session unchanged.
+    """
+    loop = asyncio.get_running_loop()
+    # Forget sessions left behind by loops that have since closed (e.g. an earlier asyncio.run)
+    for stale_loop in [other for other in _shared_sessions if other.is_closed()]:
+        del _shared_sessions[stale_loop]
+    session = _shared_sessions.get(loop)
+    if session is None or session.closed:
+        session = _shared_sessions[loop] = _create_session(scraper_config)
+    return session
+
+async def close_shared_session():
+    """Close the running loop's shared session, if one was created"""
+    session = _shared_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+class DataScraper:
+    """Scalable data scraper with configurable parameters"""
+    
+    def __init__(self, site_config: SiteConfig, scraper_config: ScraperConfig,
+                 session: Optional[aiohttp.ClientSession] = None):
+        self.site_config = site_config
+        self.scraper_config = scraper_config
+        self.ua = UserAgent()
+        # Sample user agents once; walking the fake-useragent dataset per request is slow
+        self._user_agents = itertools.cycle([self.ua.random for _ in range(32)])
+        # An injected session (e.g. get_shared_session()) keeps its warm connections
+        # and DNS cache across scrapers; otherwise one is created in __aenter__.
+        # Its own timeout and connection limit apply instead of the scraper config's
+        self.session = session
+        self._owns_session = False
+        if session is not None and (
+            session.timeout.total != scraper_config.timeout
+            or session.connector.limit != max(1, scraper_config.concurrent_requests)
+        ):
+            logger.warning(
+                "Injected session timeout/connection limit differ from the scraper config; "
+                "the session's settings apply"
+            )
+        self.books_scraped = []
+        self.errors = []
+        
+        # Shared by every fetch (across pages and categories) so the total number
+        # of in-flight requests never exceeds concurrent_requests, and shrinks
+        # while the server is rate limiting us
+        self._request_limiter = AdaptiveConcurrencyLimiter(scraper_config.concurrent_requests)
+        # Loop time at which the next request may be sent; each send reserves the
+        # following slot so requests stay delay_between_requests apart
+        self._next_send_time = 0.0
+        
+        self._category_urls: Dict[str, str] = {}
+        self._parser = PageParser(site_config)
+        # Created in __aenter__ when parse_workers is set
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        
+        # Create output directory if it doesn't exist
+        os.makedirs(self.scraper_config.output_directory, exist_ok=True)
+    
+    async def __aenter__(self):
+        """Async context manager entry"""
+        if self.session is None:
+            self.session = _create_session(self.scraper_config)
+            self._owns_session = True
+        if self.scraper_config.parse_workers > 0:
+            # Parse pages in worker processes so the event loop keeps issuing fetches
+            # Workers start lazily, after aiohttp's resolver and to_thread workers exist;
+            # forking a threaded process can deadlock, so start them from a clean server
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.scraper_config.parse_workers,
+                mp_context=multiprocessing.get_context(PARSE_WORKER_START_METHOD),
+                initializer=_init_parse_worker,
+                initargs=(self._parser,)
+            )
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        # A session passed in by the caller outlives this scraper
+        if self.session and self._owns_session:
+            await self.session.close()
+            self.session = None
+            self._owns_session = False
+        if self._parse_pool:
+            # Joining the workers blocks, so do it off the event loop
+            await asyncio.to_thread(self._parse_pool.shutdown, cancel_futures=True)
+            self._parse_pool = None
+    
+    async def _fetch_page(self, url: str, retries: int = None) -> Optional[Union[bytes, str]]:
+        """Fetch a single page's raw body with retry logic"""
+        if retries is None:
+            retries = self.scraper_config.max_retries
+        
+        for attempt in range(retries + 1):
+            generation = self._request_limiter.generation
+            try:
+                # Hold a request slot only while talking to the server, not while backing off
+                async with self._request_limiter as generation:
+                    await self._wait_for_send_slot()
+                    # Static headers live on the session; only the user agent rotates per request
+                    async with self.session.get(url, headers={'User-Agent': next(self._user_agents)}) as response:
+                        status = response.status
+                        if 200 <= status < 300:
+                            content = _decode_html(await response.read(), response.charset)
+                            self._request_limiter.record_success()
+                            logger.info(f"Successfully fetched: {url}")
+                            return content
+                        elif status in OVERLOAD_STATUSES:
+                            self._request_limiter.record_overload(generation)
+                            logger.warning(f"HTTP {status} (server overloaded) for {url}")
+                        elif status < 500:
+                            # Other client errors will not change on retry
+                            logger.warning(f"HTTP {status} for {url}, not retrying")
+                            return None
+                        else:
+                            logger.warning(f"HTTP {status} for {url}")
+                            if attempt >= SERVER_ERROR_RETRIES:
+                                return None
+            
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self._request_limiter.record_overload(generation)
+                error_msg = f"Attempt {attempt + 1} failed for {url}: {str(e)}"
+                logger.error(error_msg)
+                if attempt == retries:
+                    self.errors.append(error_msg)
+            except aiohttp.ClientError as e:
+                # Malformed responses, bad URLs and the like fail the same way every time
+                error_msg = f"Request failed for {url}: {str(e)}"
+                logger.error(error_msg)
+                self.errors.append(error_msg)
+                return None
+            
+            if attempt < retries:
+                await asyncio.sleep(_retry_delay(attempt))
         
         return None
     
+    async def _wait_for_send_slot(self):
+        """Wait until delay_between_requests has passed since the previously reserved send"""
+        delay = self.scraper_config.delay_between_requests
+        if delay <= 0:
+            return
+        now = asyncio.get_running_loop().time()
+        send_at = max(now, self._next_send_time)
+        self._next_send_time = send_at + delay
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+    
+    async def _parse_page(self, html_content: Union[bytes, str], category: str) -> Tuple[List[Book], Optional[str]]:
+        """Parse books and the next page URL from a page, in a worker process when a parse pool is running"""
+        if self._parse_pool:
+            loop = asyncio.get_running_loop()
+            books, next_url, errors = await loop.run_in_executor(
+                self._parse_pool, _parse_page_worker, html_content, category
+            )
+        else:
+            books, next_url, errors = self._parser.parse_page(html_content, category)
+        self.errors.extend(errors)
+        return books, next_url
+    
     def _build_category_url(self, category_param: str, page: int = 1) -> str:
         """Build URL for a specific category and page"""
-        base_url = self.site_config.base_url
-        params = {
-            'route': 'product/category',
-            'anl': category_param
-        }
+        # The query has a fixed shape, so format it directly and cache the page 1 URL
+        base_url = self._category_urls.get(category_param)
+        if base_url is None:
+            base_url = f"{self.site_config.base_url}?route=product/category&anl={quote(category_param, safe='')}"
+            self._category_urls[category_param] = base_url
         
         if page > 1:
-            params['page'] = str(page)
-        
-        # Construct URL with parameters
-        return f"{base_url}?{urlencode(params)}"
+            return f"{base_url}&page={page}"
+        return base_url
     
-    async def scrape_category(self, category_name: str, category_param: str, max_pages: int = None) -> List[Book]:
-        """Scrape books from a specific category"""
+    async def scrape_category(self, category_name: str, category_param: str, max_pages: int = None,
+                              writer: Optional[BookStreamWriter] = None) -> List[Book]:
+        """Scrape books from a specific category
+        
+        When a writer is given, each page is written to it as soon as it is
+        parsed and the returned list stays empty.
+        """
         if max_pages is None:
             max_pages = self.scraper_config.max_pages
         
         books = []
+        total_books = 0
         current_page = 1
         
         logger.info(f"Starting to scrape category '{category_name}' (param: {category_param})")
         
-        while current_page <= max_pages:
-            url = self._build_category_url(category_param, current_page)
-            logger.info(f"Scraping page {current_page}: {url}")
-            
-            html_content = await self._fetch_page(url)
-            if not html_content:
-                logger.error(f"Failed to fetch page {current_page}")
-                break
-            
-            page_books = self._parse_page(html_content, category_name)
-            if not page_books:
-                logger.info(f"No books found on page {current_page}, stopping pagination")
-                break
-            
-            books.extend(page_books)
-            logger.info(f"Scraped {len(page_books)} books from page {current_page}")
-            
-            # Check for next page
-            next_url = self._get_next_page_url(html_content, url)
-            if not next_url:
-                logger.info("No more pages found")
-                break
-            
-            current_page += 1
-            
-            # Delay between requests
-            if self.scraper_config.delay_between_requests > 0:
-                await asyncio.sleep(self.scraper_config.delay_between_requests)
+        # Page URLs follow a known pattern, so pages are fetched concurrently in a
+        # window of up to concurrent_requests. Page 1 is fetched alone first to
+        # confirm the category has products and more than one page before fanning out
+        fetch_tasks: Dict[int, asyncio.Task] = {}
+        next_to_fetch = 1
+        window = min(max_pages, self._request_limiter.max_limit)
+        
+        def fill_window():
+            nonlocal next_to_fetch
+            # _fetch_page spaces the actual sends by delay_between_requests
+            while next_to_fetch <= max_pages and len(fetch_tasks) < window:
+                url = self._build_category_url(category_param, next_to_fetch)
+                fetch_tasks[next_to_fetch] = asyncio.create_task(self._fetch_page(url))
+                next_to_fetch += 1
+        
+        url = self._build_category_url(category_param, current_page)
+        fetch_tasks[current_page] = asyncio.create_task(self._fetch_page(url))
+        next_to_fetch += 1
         
-        logger.info(f"Completed scraping category '{category_name}': {len(books)} books from {current_page} pages")
+        try:
+            while current_page <= max_pages:
+                url = self._build_category_url(category_param, current_page)
+                logger.info(f"Scraping page {current_page}: {url}")
+                
+                html_content = await fetch_tasks.pop(current_page)
+                if not html_content:
+                    logger.error(f"Failed to fetch page {current_page}")
+                    break
+                
+                # Refill the window before parsing so the downloads overlap with it
+                if current_page > 1:
+                    fill_window()
+                
+                page_books, next_url = await self._parse_page(html_content, category_name)
+                if not page_books:
+                    logger.info(f"No books found on page {current_page}, stopping pagination")
+                    break
+                
+                if writer:
+                    writer.write_books(page_books)
+                else:
+                    books.extend(page_books)
+                total_books += len(page_books)
+                logger.info(f"Scraped {len(page_books)} books from page {current_page}")
+                
+                # Check for next page
+                if not next_url:
+                    logger.info("No more pages found")
+                    break
+                
+                if current_page == 1:
+                    fill_window()
+                current_page += 1
+        finally:
+            # Drop fetches for pages beyond where pagination stopped
+            for task in fetch_tasks.values():
+                task.cancel()
+        
+        logger.info(f"Completed scraping category '{category_name}': {total_books} books from {current_page} pages")
         return books
     
     async def scrape_multiple_categories(self, categories: Dict[str, str], max_pages: int = None) -> Dict[str, List[Book]]:
         """Scrape multiple categories concurrently"""
-        tasks = []
-        for category_name, category_param in categories.items():
-            task = self.scrape_category(category_name, category_param, max_pages)
-            tasks.append((category_name, task))
+        # Start every category right away; _fetch_page bounds the actual request concurrency
+        tasks = [
+            asyncio.create_task(self.scrape_category(name, param, max_pages))
+            for name, param in categories.items()
+        ]
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
         
         results = {}
-        for category_name, task in tasks:
-            try:
-                books = await task
-                results[category_name] = books
-            except Exception as e:
-                logger.error(f"Error scraping category {category_name}: {str(e)}")
-                self.errors.append(f"Error scraping category {category_name}: {str(e)}")
+        for category_name, outcome in zip(categories, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error scraping category {category_name}: {str(outcome)}")
+                self.errors.append(f"Error scraping category {category_name}: {str(outcome)}")
                 results[category_name] = []
+            else:
+                results[category_name] = outcome
         
         return results
     
@@ -290,10 +688,11 @@ class DataScraper:
         else:
             json_data = data.model_dump()
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False, default=str)
+        # orjson serializes datetimes natively, so no per-field encoder is needed
+        with _open_json_output(filepath, self.scraper_config.compress_output) as f:
+            f.write(orjson.dumps(json_data, option=orjson.OPT_INDENT_2))
         
-        logger.info(f"Data saved to {filepath}")
+        logger.info(f"Data saved to {f.name}")
     
     def _save_to_csv(self, books: List[Book], filename: str):
         """Save books to CSV file"""
@@ -303,22 +702,44 @@ class DataScraper:
         
         filepath = os.path.join(self.scraper_config.output_directory, filename)
         
-        # Convert to DataFrame
-        df = pd.DataFrame([book.model_dump() for book in books])
-        df.to_csv(filepath, index=False, encoding='utf-8')
+        with open(filepath, 'w', newline='', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+            f.write(_CSV_HEADER)
+            for start in range(0, len(books), CSV_BATCH_SIZE):
+                batch = books[start:start + CSV_BATCH_SIZE]
+                f.write("".join(_csv_row(book) for book in batch))
         
         logger.info(f"Data saved to {filepath}")
     
-    def save_results(self, result: ScrapingResult):
-        """Save scraping results in the specified format(s)"""
+    def _base_filename(self, category: str) -> str:
+        """Build the timestamped output filename (without extension) for a category"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_filename = f"{result.site_name}_{result.category}_{timestamp}"
+        return f"{self.site_config.name}_{category}_{timestamp}"
+    
+    def open_stream(self, category: str) -> BookStreamWriter:
+        """Open output files for a category so books can be written page by page"""
+        base_path = os.path.join(self.scraper_config.output_directory, self._base_filename(category))
+        output_format = self.scraper_config.output_format
+        return BookStreamWriter(
+            json_path=f"{base_path}.json" if output_format in ["json", "both"] else None,
+            csv_path=f"{base_path}.csv" if output_format in ["csv", "both"] else None,
+            header={"site_name": self.site_config.name, "category": category},
+            compress=self.scraper_config.compress_output
+        )
+    
+    async def save_results(self, result: ScrapingResult):
+        """Save scraping results in the specified format(s)"""
+        base_filename = self._base_filename(result.category)
         
+        # Serializing and writing large results would block the event loop, so
+        # each file is written in a worker thread, concurrently when both are requested
+        saves = []
         if self.scraper_config.output_format in ["json", "both"]:
-            self._save_to_json(result, f"{base_filename}.json")
+            saves.append(asyncio.to_thread(self._save_to_json, result, f"{base_filename}.json"))
         
         if self.scraper_config.output_format in ["csv", "both"]:
-            self._save_to_csv(result.books, f"{base_filename}.csv")
+            saves.append(asyncio.to_thread(self._save_to_csv, result.books, f"{base_filename}.csv"))
+        
+        await asyncio.gather(*saves)
     
     async def run_scraper(self, category_name: str = "new_releases", max_pages: int = None) -> ScrapingResult:
         """Main method to run the scraper"""
@@ -330,26 +751,39 @@ class DataScraper:
         else:
             category_param = category_name  # Assume it's already a parameter
         
+        # Stream books to disk as pages complete instead of holding them all
+        writer = self.open_stream(category_name) if self.scraper_config.stream_output else None
+        
         # Scrape the category
-        books = await self.scrape_category(category_name, category_param, max_pages)
+        try:
+            books = await self.scrape_category(category_name, category_param, max_pages, writer=writer)
+        except BaseException:
+            if writer:
+                writer.close()
+            raise
         
         end_time = datetime.now()
+        total_books = writer.count if writer else len(books)
         
         # Create result object
         result = ScrapingResult(
             site_name=self.site_config.name,
             category=category_name,
-            total_books=len(books),
+            total_books=total_books,
             pages_scraped=min(max_pages or self.scraper_config.max_pages, 
-                            (len(books) // 20) + 1 if books else 1),  # Estimate pages
+                            (total_books // 20) + 1 if total_books else 1),  # Estimate pages
             books=books,
             scraping_started=start_time,
             scraping_completed=end_time,
-            success=len(books) > 0,
+            success=total_books > 0,
             errors=self.errors
         )
         
         # Save results
-        self.save_results(result)
+        if writer:
+            # Flushing the remaining buffered output is file I/O too; keep it off the loop
+            await asyncio.to_thread(writer.close, result.model_dump(exclude={"site_name", "category", "books"}))
+        else:
+            await self.save_results(result)
         
         return result
\ No newline at end of file